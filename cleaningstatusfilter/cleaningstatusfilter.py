@@ -1,13 +1,12 @@
 import logging
-from typing import List, NamedTuple, Optional
+from typing import NamedTuple, Optional
 
 from prometheus_client import Histogram, Summary
-from shapely import Point, Polygon
-from shapely.geometry import shape
 from visionapi.sae_pb2 import SaeMessage
 
 from .config import CleaningStatusFilterConfig
 from .mirrordetection import MirrorDetector, MirrorStatus
+from .nocleaningarea import NoCleaningAreaChecker
 
 logging.basicConfig(format='%(asctime)s %(name)-15s %(levelname)-8s %(processName)-10s %(message)s')
 logger = logging.getLogger(__name__)
@@ -29,7 +28,7 @@ class CleaningStatusFilter:
         logger.setLevel(self._config.log_level.value)
 
         self._mirror_detector = MirrorDetector(config.mirror_detection, config.log_level)
-        self._no_cleaning_areas: List[Polygon] = [shape(area) for area in config.no_cleaning_areas]
+        self._no_cleaning_area_checker = NoCleaningAreaChecker(config.no_cleaning_areas, config.no_cleaning_area_check, config.log_level)
 
     def __call__(self, input_proto) -> FilterResult:
         return self.get(input_proto)
@@ -38,7 +37,7 @@ class CleaningStatusFilter:
     def get(self, input_proto) -> FilterResult:
         sae_msg = self._unpack_proto(input_proto)
         # If we are in a configured no cleaning area, do not forward anything
-        if self._in_no_cleaning_area(sae_msg):
+        if self._no_cleaning_area_checker(sae_msg):
             return FilterResult(None, None)        
 
         # Check visual mirror status
@@ -58,15 +57,6 @@ class CleaningStatusFilter:
 
         return sae_msg
     
-    def _in_no_cleaning_area(self, sae_msg: SaeMessage) -> bool:
-        if not sae_msg.frame.HasField('camera_location'):
-            return False
-        
-        cam_loc = sae_msg.frame.camera_location
-        point = Point(cam_loc.longitude, cam_loc.latitude)
-        
-        return any([area.contains(point) for area in self._no_cleaning_areas])
-    
     @PROTO_SERIALIZATION_DURATION.time()
     def _pack_proto(self, sae_msg: Optional[SaeMessage]):
         return sae_msg.SerializeToString() if sae_msg is not None else None
\ No newline at end of file
@@ -41,10 +41,16 @@ class MirrorDetectionConfig(BaseModel):
         return self
 
 
+class NoCleaningAreaCheckConfig(BaseModel):
+    max_speed_mps: Annotated[float, Field(gt=0)] = 30
+    max_skip_s: Annotated[float, Field(ge=0)] = 10
+
+
 class CleaningStatusFilterConfig(BaseSettings):
     log_level: LogLevel = LogLevel.WARNING
     mirror_detection: MirrorDetectionConfig
     no_cleaning_areas: List[Polygon] = []
+    no_cleaning_area_check: NoCleaningAreaCheckConfig = NoCleaningAreaCheckConfig()
     redis: RedisConfig = RedisConfig()
     prometheus_port: Annotated[int, Field(ge=1024, le=65536)] = 8000
 
@@ -0,0 +1,106 @@
+import logging
+import math
+from typing import List, Optional
+
+from geojson_pydantic import Polygon
+from prometheus_client import Counter
+from shapely import Point
+from shapely.geometry import shape
+from shapely.ops import nearest_points
+from visionapi.sae_pb2 import SaeMessage
+
+from .config import LogLevel, NoCleaningAreaCheckConfig
+
+logger = logging.getLogger(__name__)
+
+AREA_CHECK_COUNTER = Counter('cleaning_status_filter_no_cleaning_area_check_counter', 'How many full containment checks against the no cleaning areas have been executed')
+AREA_CHECK_SKIP_COUNTER = Counter('cleaning_status_filter_no_cleaning_area_check_skip_counter', 'How many containment checks have been skipped because the vehicle cannot have reached an area boundary')
+
+# Meters per degree of latitude (and of longitude at the equator), spherical earth approximation
+METERS_PER_DEGREE = 111_320
+
+
+class NoCleaningAreaChecker:
+    """
+    Determines whether the camera location of a message lies within one of the configured no cleaning areas.
+    As the containment status can only change if the vehicle crosses an area boundary, the distance to the nearest
+    boundary is computed at every full check. Subsequent checks are skipped (returning the previous result) until the
+    vehicle could plausibly have covered that distance, either judging by the elapsed time and the configured max speed
+    or by the actually observed displacement since the last full check.
+    """
+    def __init__(self, no_cleaning_areas: List[Polygon], config: NoCleaningAreaCheckConfig, log_level: LogLevel = LogLevel.INFO):
+        logger.setLevel(log_level.value)
+        self._config = config
+
+        self._areas = [shape(area) for area in no_cleaning_areas]
+        self._area_boundaries = [area.boundary for area in self._areas]
+
+        self._last_check_location: Optional[Point] = None
+        self._last_check_timestamp_ms = 0
+        self._last_boundary_distance_m = 0.0
+        self._last_result = False
+
+    def __call__(self, sae_msg: SaeMessage) -> bool:
+        return self.in_no_cleaning_area(sae_msg)
+
+    def in_no_cleaning_area(self, sae_msg: SaeMessage) -> bool:
+        if len(self._areas) == 0 or not sae_msg.frame.HasField('camera_location'):
+            return False
+
+        cam_loc = sae_msg.frame.camera_location
+        point = Point(cam_loc.longitude, cam_loc.latitude)
+        timestamp_ms = sae_msg.frame.timestamp_utc_ms
+
+        if self._can_skip_check(point, timestamp_ms):
+            AREA_CHECK_SKIP_COUNTER.inc()
+            return self._last_result
+
+        AREA_CHECK_COUNTER.inc()
+        self._last_result = any([area.contains(point) for area in self._areas])
+        self._last_check_location = point
+        self._last_check_timestamp_ms = timestamp_ms
+        self._last_boundary_distance_m = self._distance_to_nearest_boundary_m(point)
+        logger.debug(f'In no cleaning area: {self._last_result}, distance to nearest boundary: {self._last_boundary_distance_m:.1f}m')
+
+        return self._last_result
+
+    def _can_skip_check(self, point: Point, timestamp_ms: int) -> bool:
+        if self._config.max_skip_s == 0 or self._last_check_location is None:
+            return False
+
+        # Timestamps missing (i.e. unset) or going backwards mean we cannot reason about the vehicle motion
+        if timestamp_ms <= 0:
+            return False
+
+        elapsed_ms = timestamp_ms - self._last_check_timestamp_ms
+        if elapsed_ms < 0 or elapsed_ms > self._config.max_skip_s * 1000:
+            return False
+
+        # Distance the vehicle could have covered at most, given the configured max speed
+        if elapsed_ms / 1000 * self._config.max_speed_mps >= self._last_boundary_distance_m:
+            return False
+
+        # Distance the vehicle has actually covered (guards against the configured max speed being too low)
+        if _approx_distance_m(self._last_check_location, point) >= self._last_boundary_distance_m:
+            return False
+
+        return True
+
+    def _distance_to_nearest_boundary_m(self, point: Point) -> float:
+        distance_deg, nearest_boundary = min([(boundary.distance(point), boundary) for boundary in self._area_boundaries], key=lambda d: d[0])
+        nearest_boundary_point, _ = nearest_points(nearest_boundary, point)
+
+        # A degree of longitude shrinks with cos(latitude), a degree of latitude does not.
+        # Scaling with the smallest cos(latitude) between the point and its nearest boundary point (i.e. at the larger
+        # absolute latitude) yields a lower bound for the metric distance to that boundary point. This is not strictly
+        # the nearest boundary point in metric space, but close enough for the small area extents in question.
+        max_abs_lat = max(abs(point.y), abs(nearest_boundary_point.y))
+        return distance_deg * METERS_PER_DEGREE * math.cos(math.radians(max_abs_lat))
+
+
+def _approx_distance_m(p1: Point, p2: Point) -> float:
+    # Equirectangular approximation, which is accurate enough for the short distances in question
+    mean_lat_rad = math.radians((p1.y + p2.y) / 2)
+    dx = (p2.x - p1.x) * math.cos(mean_lat_rad)
+    dy = p2.y - p1.y
+    return math.hypot(dx, dy) * METERS_PER_DEGREE
@@ -0,0 +1,116 @@
+from geojson_pydantic import Polygon
+from prometheus_client import REGISTRY
+from visionapi.sae_pb2 import SaeMessage
+
+from cleaningstatusfilter.config import NoCleaningAreaCheckConfig
+from cleaningstatusfilter.nocleaningarea import NoCleaningAreaChecker
+
+# Roughly 0.7km x 1.1km (at 50° latitude)
+AREA = Polygon(type='Polygon', coordinates=[[
+    (10.00, 50.00),
+    (10.01, 50.00),
+    (10.01, 50.01),
+    (10.00, 50.01),
+    (10.00, 50.00),
+]])
+
+# Roughly 70km x 110km (at 50° latitude), the center is ~35km away from the boundary
+LARGE_AREA = Polygon(type='Polygon', coordinates=[[
+    (9.5, 49.5),
+    (10.5, 49.5),
+    (10.5, 50.5),
+    (9.5, 50.5),
+    (9.5, 49.5),
+]])
+
+def test_contains():
+    testee = NoCleaningAreaChecker([AREA], NoCleaningAreaCheckConfig(max_skip_s=0))
+
+    assert testee(_make_sae_message(10.005, 50.005, 1000)) == True
+    assert testee(_make_sae_message(10.02, 50.005, 2000)) == False
+
+def test_no_camera_location():
+    testee = NoCleaningAreaChecker([AREA], NoCleaningAreaCheckConfig())
+
+    sae_msg = SaeMessage()
+    sae_msg.frame.timestamp_utc_ms = 1000
+    assert testee(sae_msg) == False
+
+def test_skip_keeps_result_inside_area():
+    testee = NoCleaningAreaChecker([LARGE_AREA], NoCleaningAreaCheckConfig(max_speed_mps=30, max_skip_s=10))
+    counts = _CheckCounts()
+
+    assert testee(_make_sae_message(10.0, 50.0, 1000)) == True
+    assert counts.delta() == (1, 0)
+
+    # The vehicle moves a few meters, no boundary can have been reached -> skipped, but still inside
+    assert testee(_make_sae_message(10.0001, 50.0, 2000)) == True
+    assert testee(_make_sae_message(10.0002, 50.0, 3000)) == True
+    assert counts.delta() == (1, 2)
+
+def test_recheck_on_observed_displacement():
+    # ~700m from the boundary, at 10m/s it takes ~70s to get there
+    testee = NoCleaningAreaChecker([AREA], NoCleaningAreaCheckConfig(max_speed_mps=10, max_skip_s=60))
+
+    assert testee(_make_sae_message(10.02, 50.005, 1000)) == False
+
+    # Implausible jump into the area within 1s is detected via the observed displacement
+    assert testee(_make_sae_message(10.005, 50.005, 2000)) == True
+
+def test_recheck_after_max_skip():
+    testee = NoCleaningAreaChecker([AREA], NoCleaningAreaCheckConfig(max_speed_mps=10, max_skip_s=5))
+    counts = _CheckCounts()
+
+    assert testee(_make_sae_message(10.02, 50.005, 1000)) == False
+    assert testee(_make_sae_message(10.02, 50.005, 6000)) == False
+    assert counts.delta() == (1, 1)
+
+    assert testee(_make_sae_message(10.02, 50.005, 6001)) == False
+    assert counts.delta() == (2, 1)
+
+def test_recheck_when_boundary_in_reach():
+    testee = NoCleaningAreaChecker([AREA], NoCleaningAreaCheckConfig(max_speed_mps=1000, max_skip_s=60))
+    counts = _CheckCounts()
+
+    assert testee(_make_sae_message(10.02, 50.005, 1000)) == False
+    assert testee(_make_sae_message(10.02, 50.005, 2000)) == False
+    assert counts.delta() == (2, 0)
+
+def test_recheck_on_timestamp_going_backwards():
+    testee = NoCleaningAreaChecker([AREA], NoCleaningAreaCheckConfig(max_speed_mps=10, max_skip_s=60))
+    counts = _CheckCounts()
+
+    assert testee(_make_sae_message(10.02, 50.005, 5000)) == False
+    assert testee(_make_sae_message(10.02, 50.005, 4000)) == False
+    assert counts.delta() == (2, 0)
+
+def test_recheck_on_missing_timestamps():
+    testee = NoCleaningAreaChecker([AREA], NoCleaningAreaCheckConfig(max_speed_mps=10, max_skip_s=5))
+    counts = _CheckCounts()
+
+    for _ in range(3):
+        assert testee(_make_sae_message(10.02, 50.005, None)) == False
+    assert counts.delta() == (3, 0)
+
+class _CheckCounts:
+    # Prometheus counters are global, therefore we track the change relative to instantiation
+    def __init__(self):
+        self._initial = self._read()
+
+    def delta(self):
+        current = self._read()
+        return (current[0] - self._initial[0], current[1] - self._initial[1])
+
+    def _read(self):
+        return (
+            REGISTRY.get_sample_value('cleaning_status_filter_no_cleaning_area_check_counter_total') or 0,
+            REGISTRY.get_sample_value('cleaning_status_filter_no_cleaning_area_check_skip_counter_total') or 0,
+        )
+
+def _make_sae_message(longitude: float, latitude: float, timestamp_ms: int | None) -> SaeMessage:
+    sae_msg = SaeMessage()
+    if timestamp_ms is not None:
+        sae_msg.frame.timestamp_utc_ms = timestamp_ms
+    sae_msg.frame.camera_location.longitude = longitude
+    sae_msg.frame.camera_location.latitude = latitude
+    return sae_msg